@@ -0,0 +1,123 @@
+"""
+Shared pytest fixtures for the TickTick MCP tests.
+
+The client is set up once per session, either against a mocked TickTick API
+(the default) or against the live API for tests run with -m integration.
+"""
+
+import asyncio
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+
+import pytest
+import responses
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+from ticktick_mcp.src import server
+from ticktick_mcp.src.server import initialize_client
+
+# Use uvloop's faster event loop where it is available. This runs at import so it
+# also applies inside pytest-xdist workers.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
+# Mocked API data, in the format returned by the TickTick Open API
+def _ticktick_date(dt: datetime) -> str:
+    return dt.strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+_NOW = datetime.now(timezone.utc)
+# Late today in local time, so a task due then is due today but not yet overdue
+_LATER_TODAY = datetime.now().astimezone().replace(hour=23, minute=59, second=0, microsecond=0)
+
+FIXTURE_PROJECTS = [
+    {"id": "6226ff9877acee87727f6bca", "name": "Work", "color": "#F18181",
+     "viewMode": "list", "closed": False, "kind": "TASK"},
+]
+
+FIXTURE_PROJECT_DATA = {
+    "project": FIXTURE_PROJECTS[0],
+    "tasks": [
+        {"id": "63b7bebb91c0a5474805fcd4", "projectId": "6226ff9877acee87727f6bca",
+         "title": "Review Q4 report", "priority": 5, "status": 0,
+         "dueDate": _ticktick_date(_NOW - timedelta(days=2))},
+        {"id": "63b7bebb91c0a5474805fcd5", "projectId": "6226ff9877acee87727f6bca",
+         "title": "Client meeting", "content": "Prepare the agenda", "priority": 3, "status": 0,
+         "dueDate": _ticktick_date(_LATER_TODAY.astimezone(timezone.utc)),
+         "items": [{"id": "6435074647fd2e6387145f20", "title": "Book a room", "status": 1}]},
+    ],
+}
+
+FIXTURE_INBOX_DATA = {
+    "project": {"id": "inbox116792701", "name": "Inbox"},
+    "tasks": [
+        {"id": "63b7bebb91c0a5474805fcd6", "projectId": "inbox116792701",
+         "title": "Buy groceries", "priority": 0, "status": 0},
+    ],
+}
+
+def _mock_api() -> responses.RequestsMock:
+    """Serve the fixture data for every endpoint the read-only tools use."""
+    mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+    mock.get(re.compile(r".*/project$"), json=FIXTURE_PROJECTS)
+    mock.get(re.compile(r".*/project/6226ff9877acee87727f6bca/data$"), json=FIXTURE_PROJECT_DATA)
+    mock.get(re.compile(r".*/project/inbox\w*/data$"), json=FIXTURE_INBOX_DATA)
+    return mock
+
+@pytest.fixture(scope="session", params=[
+    "mock",
+    pytest.param("live", marks=pytest.mark.integration),
+])
+def client(request):
+    """Initialize the TickTick client once per mode: mocked API or live API."""
+    if request.param == "live":
+        if not initialize_client():
+            pytest.skip("Failed to initialize client. Check your .env file.")
+        yield
+        return
+
+    with pytest.MonkeyPatch.context() as mp, _mock_api():
+        mp.setenv("TICKTICK_ACCESS_TOKEN", os.getenv("TICKTICK_ACCESS_TOKEN") or "test-token")
+        assert initialize_client()
+        yield
+
+@contextmanager
+def _fresh_mocked_client() -> Iterator[responses.RequestsMock]:
+    """
+    Initialize a client against its own mocked API, with an empty request log.
+    The previous client and an empty cache are restored on exit.
+    """
+    saved_client = server.ticktick
+    with pytest.MonkeyPatch.context() as mp, _mock_api() as mock:
+        mp.setenv("TICKTICK_ACCESS_TOKEN", "test-token")
+        assert initialize_client()
+        mock.calls.reset()
+        yield mock
+    server.ticktick = saved_client
+    server._clear_cache()
+
+@pytest.fixture
+def api():
+    """
+    A freshly initialized client against its own mocked API, for tests that add
+    routes or inspect the requests made.
+    """
+    with _fresh_mocked_client() as mock:
+        yield mock
+
+@pytest.fixture(scope="module")
+def shared_api():
+    """
+    One mocked client whose cache stays warm across a module's tests, so tests
+    can check that they are all served from a single fetch of each project.
+    """
+    with _fresh_mocked_client() as mock:
+        yield mock
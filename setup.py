@@ -12,7 +12,17 @@ setup(
         "mcp[cli]>=1.2.0,<2.0.0",
         "python-dotenv>=1.0.0,<2.0.0",
         "requests>=2.30.0,<3.0.0",
+        "orjson>=3.8.0,<4.0.0",
     ],
+    extras_require={
+        "test": [
+            "pytest>=8.0.0",
+            "pytest-asyncio>=0.26.0",
+            "pytest-xdist>=3.5.0",
+            "responses>=0.25.0",
+            "uvloop>=0.19.0; platform_system != 'Windows'",
+        ],
+    },
     python_requires=">=3.10",
     entry_points={
         "console_scripts": [
@@ -1,147 +1,315 @@
 #!/usr/bin/env python3
 """
 Functional test for TickTick MCP server tools.
-Tests filter_tasks and other tools with actual API calls.
+Tests filter_tasks and other tools against a mocked TickTick API, and against
+the real API when run with -m integration (fixtures live in conftest.py).
+
+Run with: uv run pytest test_mcp_tools.py
 """
 
-import os
-import sys
 import asyncio
-from dotenv import load_dotenv
+import json
+import re
+import sys
+import threading
 
-# Load environment variables
-load_dotenv()
+import pytest
+import responses
 
-# Import after loading env
+from ticktick_mcp.src import server
 from ticktick_mcp.src.server import (
-    initialize_client, filter_tasks, get_projects, 
-    get_project_tasks, create_task, engaged, next_actions
+    filter_tasks, get_projects,
+    get_project_tasks, create_task, create_subtasks, engaged, next_actions
 )
 
-async def test_tools():
-    """Test the actual tool functions."""
-    
-    print("=" * 70)
-    print("Functional Test: TickTick MCP Server Tools")
-    print("=" * 70)
-    
-    # Initialize client
-    print("\n1. Initializing TickTick client...")
-    if not initialize_client():
-        print("❌ Failed to initialize client. Check your .env file.")
-        return False
-    print("✅ Client initialized successfully")
-    
-    # Test get_projects
-    print("\n2. Testing get_projects tool...")
-    try:
-        result = await get_projects()
-        if "Error" in result or "Failed" in result:
-            print(f"❌ Error: {result}")
-            return False
-        print("✅ get_projects working")
-        print(f"   Result preview: {result[:100]}...")
-    except Exception as e:
-        print(f"❌ Exception: {e}")
-        return False
-    
-    # Test filter_tasks with different parameters
-    print("\n3. Testing filter_tasks tool...")
-    
-    test_cases = [
-        ("all tasks", {}),
-        ("overdue tasks", {"date_filter": "overdue"}),
-        ("today tasks", {"date_filter": "today"}),
-        ("high priority", {"priority": 5}),
-        ("all tasks (default)", {"date_filter": "all"}),
-    ]
-    
-    for test_name, params in test_cases:
-        try:
-            print(f"   Testing: {test_name}")
-            result = await filter_tasks(**params)
-            if "Error" in result or "Failed" in result:
-                print(f"      ⚠️  Warning: {result[:100]}")
-            else:
-                print(f"      ✅ Success - returned {len(result)} characters")
-        except Exception as e:
-            print(f"      ❌ Exception: {e}")
-            return False
-    
-    # Test filter_tasks with invalid parameters
-    print("\n4. Testing filter_tasks validation...")
-    try:
-        result = await filter_tasks(date_filter="invalid")
-        if "Invalid date_filter" in result:
-            print("   ✅ Invalid date_filter properly rejected")
-        else:
-            print(f"   ⚠️  Unexpected response: {result[:100]}")
-    except Exception as e:
-        print(f"   ❌ Exception: {e}")
-    
-    try:
-        result = await filter_tasks(priority=99)
-        if "Invalid priority" in result:
-            print("   ✅ Invalid priority properly rejected")
-        else:
-            print(f"   ⚠️  Unexpected response: {result[:100]}")
-    except Exception as e:
-        print(f"   ❌ Exception: {e}")
-    
-    # Test prompts
-    print("\n5. Testing prompts...")
-    try:
-        result = await engaged()
-        if isinstance(result, list) and len(result) > 0:
-            print("   ✅ engaged prompt returns valid format")
-            if 'role' in result[0] and 'content' in result[0]:
-                print("   ✅ Prompt message structure correct")
-        else:
-            print(f"   ❌ Invalid format: {type(result)}")
-    except Exception as e:
-        print(f"   ❌ Exception: {e}")
-    
-    try:
-        result = await next_actions()
-        if isinstance(result, list) and len(result) > 0:
-            print("   ✅ next_actions prompt returns valid format")
-            if 'role' in result[0] and 'content' in result[0]:
-                print("   ✅ Prompt message structure correct")
-        else:
-            print(f"   ❌ Invalid format: {type(result)}")
-    except Exception as e:
-        print(f"   ❌ Exception: {e}")
-    
-    # Test get_project_tasks if we have projects
-    print("\n6. Testing get_project_tasks...")
-    try:
-        projects_result = await get_projects()
-        if "inbox" in projects_result.lower() or "project" in projects_result.lower():
-            # Try to get inbox tasks
-            result = await get_project_tasks("inbox")
-            if "Error" not in result and "Failed" not in result:
-                print("   ✅ get_project_tasks('inbox') working")
-            else:
-                print(f"   ⚠️  Note: {result[:100]}")
-        else:
-            print("   ⚠️  Could not determine project structure")
-    except Exception as e:
-        print(f"   ⚠️  Exception (non-critical): {e}")
-    
-    print("\n" + "=" * 70)
-    print("✅ All functional tests completed!")
-    print("=" * 70)
-    return True
+# Tests run in parallel under pytest-xdist (see pytest.ini). Tests that create,
+# update or delete TickTick data must be marked @pytest.mark.xdist_group("mutating")
+# so they run on a single worker.
+
+# Task IDs in the mocked API data (see conftest.py)
+OVERDUE_TASK = "63b7bebb91c0a5474805fcd4"
+TODAY_TASK = "63b7bebb91c0a5474805fcd5"
+INBOX_TASK = "63b7bebb91c0a5474805fcd6"
+WORK_PROJECT = "6226ff9877acee87727f6bca"
+
+# filter_tasks arguments and the IDs of the mocked tasks they should list
+FILTER_CASES = [
+    pytest.param({}, [OVERDUE_TASK, TODAY_TASK, INBOX_TASK], id="all tasks"),
+    pytest.param({"date_filter": "all"}, [OVERDUE_TASK, TODAY_TASK, INBOX_TASK], id="all tasks (default)"),
+    pytest.param({"date_filter": "overdue"}, [OVERDUE_TASK], id="overdue tasks"),
+    pytest.param({"date_filter": "today"}, [TODAY_TASK], id="today tasks"),
+    pytest.param({"date_filter": "tomorrow"}, [], id="tomorrow tasks"),
+    pytest.param({"date_filter": "this_week"}, [TODAY_TASK], id="this week tasks"),
+    pytest.param({"date_filter": "next_7_days"}, [TODAY_TASK], id="next 7 days tasks"),
+    pytest.param({"search_term": "room"}, [TODAY_TASK], id="search subtasks"),
+    pytest.param({"search_term": "AGENDA"}, [TODAY_TASK], id="search content"),
+    pytest.param({"search_term": "groceries"}, [INBOX_TASK], id="search titles"),
+    pytest.param({"date_filter": "overdue", "priority": 5}, [OVERDUE_TASK], id="overdue high priority"),
+    pytest.param({"date_filter": "today", "priority": 5}, [], id="today high priority"),
+    pytest.param({"priority": 5}, [OVERDUE_TASK], id="high priority"),
+    pytest.param({"priority": 3}, [TODAY_TASK], id="medium priority"),
+    pytest.param({"priority": 0}, [INBOX_TASK], id="no priority"),
+    pytest.param({"priority": 1}, [], id="low priority"),
+    pytest.param({"priority": 5, "project_id": WORK_PROJECT}, [OVERDUE_TASK], id="high priority in project"),
+    pytest.param({"priority": 0, "project_id": "inbox"}, [INBOX_TASK], id="no priority in inbox"),
+]
+
+def _listed_task_ids(result: str) -> list:
+    """IDs of the tasks listed in filter_tasks output, in order."""
+    return re.findall(r"Task \d+:\nID: (\S+)", result)
+
+@pytest.fixture(scope="session")
+async def projects_result(client):
+    """Fetch the project listing once and share it between tests."""
+    return await get_projects()
+
+async def test_get_projects(projects_result):
+    assert projects_result.ok, projects_result
+
+async def test_filter_tasks(client):
+    result = await filter_tasks()
+    assert result.ok, result[:100]
+
+# The variants run in order on one worker so they share shared_api's warm cache
+@pytest.mark.xdist_group("filter_variants")
+@pytest.mark.parametrize("params, expected_ids", FILTER_CASES)
+async def test_filter_tasks_variants(shared_api, params, expected_ids):
+    result = await filter_tasks(**params)
+    assert result.ok, result[:100]
+    assert _listed_task_ids(result) == expected_ids
+    
+    # Every variant is filtered from the first fetch of each project
+    fetches = _data_fetches(shared_api)
+    assert len(fetches) == len(set(fetches)), fetches
+
+async def test_task_index_kept_outside_responses(api):
+    await filter_tasks(priority=5)
+    project_data = await server.cached_get_project_with_data(WORK_PROJECT)
+    assert set(project_data) == {"project", "tasks"}
+
+async def test_filter_validation(client):
+    result = await filter_tasks(date_filter="invalid")
+    assert result.error_kind == "invalid_date_filter", result[:100]
+
+    result = await filter_tasks(priority=99)
+    assert result.error_kind == "invalid_priority", result[:100]
+
+@pytest.mark.parametrize("prompt", [engaged, next_actions])
+async def test_prompts(prompt):
+    result = await prompt()
+    assert isinstance(result, list) and len(result) > 0, type(result)
+    assert 'role' in result[0] and 'content' in result[0]
+
+async def test_get_project_tasks(projects_result):
+    if "inbox" not in projects_result.lower() and "project" not in projects_result.lower():
+        pytest.skip("Could not determine project structure")
+
+    result = await get_project_tasks("inbox")
+    assert result.ok, result[:100]
+
+async def test_ensure_client_publishes_only_verified_client(api, monkeypatch):
+    client = server.ticktick
+    probe_started, release_probe = threading.Event(), threading.Event()
+    
+    def slow_connect():
+        probe_started.set()
+        release_probe.wait(5)
+        return client, []
+    
+    monkeypatch.setattr(server, "ticktick", None)
+    monkeypatch.setattr(server, "_connect_client", slow_connect)
+    
+    first = asyncio.ensure_future(server.ensure_client())
+    await asyncio.to_thread(probe_started.wait, 5)
+    # The unverified client isn't visible, so a concurrent call waits for the probe
+    assert server.ticktick is None
+    second = asyncio.ensure_future(server.ensure_client())
+    await asyncio.sleep(0)
+    assert not second.done()
+    
+    release_probe.set()
+    assert await first and await second
+    assert server.ticktick is client
+
+async def test_ensure_client_retries_after_failed_probe(api, monkeypatch):
+    attempts = []
+    monkeypatch.setattr(server, "ticktick", None)
+    monkeypatch.setattr(server, "_connect_client", lambda: attempts.append(1))
+    
+    assert not await server.ensure_client()
+    assert server.ticktick is None
+    
+    result = await server.get_task("p1", "t1")
+    assert result.error_kind == "client_init"
+    assert len(attempts) == 2
+
+async def test_project_with_null_tasks(api):
+    api.get(re.compile(r".*/project/p1/data$"),
+            json={"project": {"id": "p1", "name": "Empty"}, "tasks": None})
+    
+    result = await get_project_tasks("p1")
+    assert result.ok and "No tasks found in project 'Empty'" in result, result
+    
+    result = await filter_tasks(project_id="p1")
+    assert result.ok and "With 0 tasks" in result, result
+
+@pytest.mark.parametrize("params", [{}, {"project_id": WORK_PROJECT}], ids=["all projects", "one project"])
+async def test_filtering_runs_off_event_loop(api, monkeypatch, params):
+    filter_records = server._filter_task_records
+    threads = []
+    
+    def recording_filter(*args):
+        threads.append(threading.get_ident())
+        return filter_records(*args)
+    
+    monkeypatch.setattr(server, "_filter_task_records", recording_filter)
+    result = await filter_tasks(**params)
+    assert result.ok, result
+    assert threads and threading.get_ident() not in threads
+
+@pytest.mark.parametrize("status, error_kind", [
+    pytest.param(404, "project_not_found", id="missing project"),
+    pytest.param(500, "api_error", id="server error"),
+])
+async def test_filter_tasks_project_errors(api, status, error_kind):
+    api.get(re.compile(r".*/project/p1/data$"), status=status)
+    
+    result = await filter_tasks(project_id="p1")
+    assert result.error_kind == error_kind, result
+    if error_kind == "api_error":
+        assert result.startswith("Error fetching project data:"), result
+
+def _mock_task_create(api) -> list:
+    """Answer POST /task with the created task; a task titled "fail" gets a 500."""
+    posted = []
+    
+    def create(request):
+        task = json.loads(request.body)
+        posted.append(task["title"])
+        if task["title"] == "fail":
+            return 500, {}, json.dumps({"errorMessage": "server error"})
+        return 200, {}, json.dumps({"id": f"sub{len(posted)}", **task})
+    
+    api.add_callback(responses.POST, re.compile(r".*/task$"), callback=create,
+                     content_type="application/json")
+    return posted
+
+async def test_create_subtasks_in_order(api):
+    posted = _mock_task_create(api)
+    
+    result = await create_subtasks(OVERDUE_TASK, "inbox",
+                                   [{"title": "first"}, {"title": "fail"}, {"title": "third"}])
+    assert posted == ["first", "fail", "third"]
+    assert result.startswith("Created 2 of 3 subtasks:"), result
+    assert "Subtask 2: Error:" in result, result
+    assert "Subtask 1:\nID: sub1" in result and "Subtask 3:\nID: sub3" in result, result
+
+@pytest.mark.parametrize("subtasks, error", [
+    pytest.param([{"title": "ok"}, {"content": "no title"}],
+                 "Subtask 2: 'title' is required", id="missing title"),
+    pytest.param([{"title": "ok", "priority": 2}],
+                 "Subtask 1: Invalid priority 2", id="bad priority"),
+    pytest.param([{"title": "ok"}, "not a dict"],
+                 "Subtask 2: must be a dictionary", id="not a dict"),
+])
+async def test_create_subtasks_validation(api, subtasks, error):
+    posted = _mock_task_create(api)
+    
+    result = await create_subtasks(OVERDUE_TASK, "inbox", subtasks)
+    assert result.startswith(f"Validation error: {error}"), result
+    assert posted == []
+
+@pytest.mark.parametrize("params, expected_ids, note", [
+    pytest.param({"limit": 1}, [OVERDUE_TASK], "3 matching tasks, truncated to 1", id="cut"),
+    pytest.param({"limit": 2}, [OVERDUE_TASK, TODAY_TASK], "truncated to 2", id="cut at project end"),
+    pytest.param({"limit": 3}, [OVERDUE_TASK, TODAY_TASK, INBOX_TASK], None, id="exact"),
+    pytest.param({"project_id": WORK_PROJECT, "limit": 1}, [OVERDUE_TASK],
+                 "2 matching tasks, truncated to 1", id="single project"),
+])
+async def test_filter_tasks_limit(api, params, expected_ids, note):
+    result = await filter_tasks(**params)
+    assert result.ok, result
+    assert _listed_task_ids(result) == expected_ids
+    assert (note in result) if note else ("truncated" not in result), result
+    # Each project header says how many of its matches made it into the listing
+    for section in re.split(r"\nProject \d+:\n", result)[1:]:
+        total, shown = re.search(r"With (\d+) tasks .*?(?:, first (\d+) listed)? :", section).groups()
+        assert len(_listed_task_ids(section)) == int(shown or total), section
+
+@pytest.mark.parametrize("total, limit, expected", [
+    (3, None, ""),
+    (3, 3, ""),
+    (3, 5, ""),
+    (4, 3, "... (4 matching tasks, truncated to 3; pass limit=N for more)\n"),
+])
+def test_truncation_note(total, limit, expected):
+    assert server._truncation_note(total, limit) == expected
+
+@pytest.mark.parametrize("limit", [0, -1])
+async def test_filter_tasks_rejects_bad_limit(api, limit):
+    result = await filter_tasks(limit=limit)
+    assert result.error_kind == "invalid_limit", result
+    assert len(api.calls) == 0
+
+def _data_fetches(api) -> list:
+    """URLs of the project data requests the mocked API has served."""
+    return [call.request.url for call in api.calls if call.request.url.endswith("/data")]
+
+async def test_cache_serves_repeat_reads(api):
+    first = await get_project_tasks(WORK_PROJECT)
+    second = await get_project_tasks(WORK_PROJECT)
+    assert first == second and first.ok, first
+    assert len(_data_fetches(api)) == 1
+
+async def test_write_drops_cached_project(api):
+    api.post(re.compile(r".*/task/\w+/complete$"), json={})
+    
+    await get_project_tasks(WORK_PROJECT)
+    assert f"project_data:{WORK_PROJECT}" in server._cache
+    
+    assert "marked as complete" in await server.complete_task(WORK_PROJECT, OVERDUE_TASK)
+    assert f"project_data:{WORK_PROJECT}" not in server._cache
+    
+    await get_project_tasks(WORK_PROJECT)
+    assert len(_data_fetches(api)) == 2
+
+@pytest.mark.parametrize("written_id", ["inbox", "inbox116792701"])
+async def test_inbox_aliases_invalidated_together(api, written_id):
+    await server.cached_get_project_with_data("inbox")
+    await server.cached_get_project_with_data("inbox116792701")
+    await server.cached_get_project_with_data(WORK_PROJECT)
+    
+    server._invalidate_cache(written_id)
+    assert sorted(server._cache) == [f"project_data:{WORK_PROJECT}", "projects"]
+
+async def test_fetch_overlapping_invalidation_not_cached(api):
+    def write_during_fetch(request):
+        # A write lands while the read is in flight
+        server._invalidate_cache("p1")
+        return 200, {}, json.dumps({"project": {"id": "p1", "name": "Racing"}, "tasks": []})
+    
+    api.add_callback(responses.GET, re.compile(r".*/project/p1/data$"),
+                     callback=write_during_fetch, content_type="application/json")
+    
+    result = await server.cached_get_project_with_data("p1")
+    assert result["project"]["name"] == "Racing"
+    assert "project_data:p1" not in server._cache
+    
+    await server.cached_get_project_with_data("p1")
+    assert len(_data_fetches(api)) == 2
+
+@pytest.mark.parametrize("date_str, valid", [
+    ("2025-11-05T10:00:00Z", True),
+    ("2025-11-05T10:00:00z", True),
+    ("2025-11-05T10:00:00+0000", True),
+    ("2025-11-05T10:00:00+00:00", True),
+    ("2025-11-05", True),
+    ("2025-11-05T10:00:00.123+0000", True),
+    ("2025-13-01", False),
+    ("2025-11-05+0000", False),
+])
+def test_is_valid_iso_date(date_str, valid):
+    assert server._is_valid_iso_date(date_str) is valid
 
 if __name__ == "__main__":
-    try:
-        success = asyncio.run(test_tools())
-        sys.exit(0 if success else 1)
-    except KeyboardInterrupt:
-        print("\n\n⚠️  Test interrupted by user")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n\n❌ Test failed with exception: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    sys.exit(pytest.main([__file__, "-v"]))
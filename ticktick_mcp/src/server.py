@@ -1,9 +1,12 @@
 import asyncio
 import json
 import os
+import re
 import logging
+import time
+from functools import lru_cache, wraps
 from datetime import datetime, timezone, date, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Awaitable, Callable, Dict, List, Any, NamedTuple, Optional, Tuple
 
 from mcp.server.fastmcp import FastMCP
 from dotenv import load_dotenv
@@ -20,8 +23,46 @@ mcp = FastMCP("ticktick")
 # Create TickTick client
 ticktick = None
 
-def initialize_client():
-    global ticktick
+# Short-lived cache of read-only API responses, keyed by endpoint (and ID)
+CACHE_TTL_SECONDS = 30
+_cache: Dict[str, Tuple[float, Any]] = {}
+_cache_locks: Dict[str, asyncio.Lock] = {}
+# Bumped on every invalidation, so a fetch that was already in flight when
+# the data changed doesn't store its (possibly stale) response
+_cache_generation = 0
+
+# Maximum number of TickTick API requests in flight at once, to respect rate
+# limits and stay within the client's connection pool
+MAX_CONCURRENT_REQUESTS = 8
+_api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# Serializes lazy client initialization across concurrent tool calls
+_init_lock = asyncio.Lock()
+
+# Accepted argument values, checked on every tool call
+_VALID_PRIORITIES = frozenset((0, 1, 3, 5))
+_VALID_VIEW_MODES = frozenset(("list", "kanban", "timeline"))
+_DATE_FILTERS = ("all", "today", "tomorrow", "overdue", "this_week", "next_7_days")
+_VALID_DATE_FILTERS = frozenset(_DATE_FILTERS)
+_VALID_PRIORITIES_TEXT = ", ".join(map(str, sorted(_VALID_PRIORITIES)))
+_VALID_DATE_FILTERS_TEXT = ", ".join(_DATE_FILTERS)
+
+# TickTick writes UTC offsets as +0000; fromisoformat (Python 3.10) needs +00:00
+_TZ_FIX = re.compile(r'([+-])(\d{2})(\d{2})$')
+
+# Shape of an ISO 8601 date or date-time accepted by the task tools
+_ISO_RE = re.compile(
+    r'^\d{4}-\d{2}-\d{2}(T\d{2}:\d{2}(:\d{2}(\.\d+)?)?([Zz]|[+-]\d{2}:?\d{2})?)?$'
+)
+
+def _connect_client() -> Optional[Tuple[TickTickClient, List[Dict]]]:
+    """
+    Create a TickTick client and check that it can reach the API.
+    
+    Returns:
+        The client and the project list fetched by the connectivity probe,
+        or None if the client could not be created or the probe failed
+    """
     try:
         # Check if .env file exists with access token
         load_dotenv()
@@ -29,90 +70,288 @@ def initialize_client():
         # Check if we have valid credentials
         if os.getenv("TICKTICK_ACCESS_TOKEN") is None:
             logger.error("No access token found in .env file. Please run 'uv run -m ticktick_mcp.cli auth' to authenticate.")
-            return False
+            return None
         
         # Initialize the client
-        ticktick = TickTickClient()
+        client = TickTickClient()
         logger.info("TickTick client initialized successfully")
         
         # Test API connectivity
-        projects = ticktick.get_projects()
+        projects = client.get_projects()
         if 'error' in projects:
             logger.error(f"Failed to access TickTick API: {projects['error']}")
             logger.error("Your access token may have expired. Please run 'uv run -m ticktick_mcp.cli auth' to refresh it.")
-            return False
+            return None
             
         logger.info(f"Successfully connected to TickTick API with {len(projects)} projects")
-        return True
+        return client, projects
     except Exception as e:
         logger.error(f"Failed to initialize TickTick client: {e}")
+        return None
+
+def _install_client(client: TickTickClient, projects: List[Dict]) -> None:
+    """Make a verified client the module's client, starting from a fresh cache."""
+    global ticktick
+    _clear_cache()
+    _cache["projects"] = (time.monotonic(), projects)
+    ticktick = client
+
+def initialize_client():
+    connected = _connect_client()
+    if connected is None:
         return False
+    _install_client(*connected)
+    return True
+
+async def ensure_client() -> bool:
+    """
+    Make sure the TickTick client is initialized, initializing it on first use.
+    
+    The connectivity probe runs in a worker thread so it doesn't block the event
+    loop, and concurrent first calls share a single initialization. The client
+    is only made visible to other calls once the probe has succeeded, so a
+    failed probe is retried on the next call.
+    """
+    if ticktick is not None:
+        return True
+    
+    async with _init_lock:
+        # Another call may have initialized the client while we waited
+        if ticktick is not None:
+            return True
+        connected = await asyncio.to_thread(_connect_client)
+        if connected is None:
+            return False
+        # Install on the event loop so the cache isn't touched from the worker thread
+        _install_client(*connected)
+        return True
+
+def requires_client(tool: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """
+    Run a tool only once the TickTick client is initialized.
+    
+    Once the client exists, calls go straight to the tool; until then,
+    initialization is attempted through ensure_client and the tool returns
+    a client_init error if it fails. Apply it below @mcp.tool().
+    """
+    @wraps(tool)
+    async def wrapper(*args, **kwargs) -> str:
+        if ticktick is None and not await ensure_client():
+            return ToolResult("Failed to initialize TickTick client. Please check your API credentials.", "client_init")
+        return await tool(*args, **kwargs)
+    
+    return wrapper
+
+def _clear_cache() -> None:
+    """Drop all cached API responses."""
+    global _cache_generation
+    _cache_generation += 1
+    _cache.clear()
+    _cache_locks.clear()
+    _task_indexes.clear()
+
+def _invalidate_cache(project_id: Optional[str] = None, projects: bool = False) -> None:
+    """
+    Drop cached API responses made stale by a write.
+    
+    Args:
+        project_id: Project whose task data changed
+        projects: Whether the project list itself changed
+    """
+    global _cache_generation
+    _cache_generation += 1
+    if projects:
+        _cache.pop("projects", None)
+    if project_id:
+        # The inbox is reachable both as "inbox" and by its real "inbox<user id>" ID
+        if project_id.lower().startswith("inbox"):
+            keys = [k for k in _cache if k.lower().startswith("project_data:inbox")]
+        else:
+            keys = [f"project_data:{project_id}"]
+        for key in keys:
+            _cache.pop(key, None)
+            _task_indexes.pop(key, None)
+
+async def _call_api(method: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking TickTickClient method in a worker thread.
+    
+    The client is built on requests, so calling it directly from a tool would
+    stall the event loop (and every other tool call) for the whole round-trip.
+    At most MAX_CONCURRENT_REQUESTS calls run at once.
+    """
+    async with _api_semaphore:
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+async def _cached_call(key: str, fetch: Callable[[], Any]) -> Any:
+    """
+    Return a cached API response, fetching it in a worker thread if it is missing or expired.
+    
+    Error responses, and responses fetched while the cache was being
+    invalidated, are returned but never cached. Concurrent callers asking for
+    the same key share a single request.
+    """
+    entry = _cache.get(key)
+    if entry and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+        return entry[1]
+    
+    async with _cache_locks.setdefault(key, asyncio.Lock()):
+        # Another caller may have refreshed the entry while we waited
+        entry = _cache.get(key)
+        if entry and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+            return entry[1]
+        
+        generation = _cache_generation
+        value = await _call_api(fetch)
+        if 'error' not in value and generation == _cache_generation:
+            _cache[key] = (time.monotonic(), value)
+        return value
+
+async def cached_get_projects() -> List[Dict]:
+    """Get all projects, served from the cache when fresh."""
+    return await _cached_call("projects", ticktick.get_projects)
+
+async def cached_get_project_with_data(project_id: str) -> Dict:
+    """Get a project with its tasks, served from the cache when fresh."""
+    return await _cached_call(
+        f"project_data:{project_id}",
+        lambda: ticktick.get_project_with_data(project_id)
+    )
+
+# Tool output that also records whether the call succeeded
+class ToolResult(str):
+    """
+    Text returned by a tool, tagged with the outcome of the call.
+    
+    Subclasses str so FastMCP sends it to the client unchanged, while Python
+    callers can check `ok` / `error_kind` instead of searching the text.
+    """
+    ok: bool
+    error_kind: Optional[str]
+    
+    def __new__(cls, text: str, error_kind: Optional[str] = None) -> "ToolResult":
+        result = super().__new__(cls, text)
+        result.error_kind = error_kind
+        result.ok = error_kind is None
+        return result
+    
+    @property
+    def text(self) -> str:
+        """The plain text sent over the MCP transport."""
+        return str(self)
 
 # Format a task object from TickTick for better display
 def format_task(task: Dict) -> str:
     """Format a task into a human-readable string."""
-    formatted = f"ID: {task.get('id', 'No ID')}\n"
-    formatted += f"Title: {task.get('title', 'No title')}\n"
-    
-    # Add project ID
-    formatted += f"Project ID: {task.get('projectId', 'None')}\n"
+    # Bind lookups locally; this runs once per task in every listing
+    _get = task.get
+    _item_get = dict.get
+    items = _get('items') or ()
+    fields = (
+        _get('id', 'No ID'),
+        _get('title', 'No title'),
+        _get('projectId', 'None'),
+        _get('startDate'),
+        _get('dueDate'),
+        _get('priority', 0),
+        _get('status'),
+        _get('content'),
+        tuple((_item_get(item, 'title', 'No title'), _item_get(item, 'status')) for item in items),
+    )
+    try:
+        return _format_task_fields(*fields)
+    except TypeError:
+        # Unhashable field values can't be cached; format them directly
+        return _format_task_fields.__wrapped__(*fields)
+
+# Unchanged tasks format to the same text, so repeated calls reuse it
+@lru_cache(maxsize=1024)
+def _format_task_fields(task_id, title, project_id, start_date, due_date,
+                        priority, status, content, items) -> str:
+    """Format the task fields used by format_task."""
+    lines = [
+        f"ID: {task_id}",
+        f"Title: {title}",
+        # Add project ID
+        f"Project ID: {project_id}",
+    ]
     
     # Add dates if available
-    if task.get('startDate'):
-        formatted += f"Start Date: {task.get('startDate')}\n"
-    if task.get('dueDate'):
-        formatted += f"Due Date: {task.get('dueDate')}\n"
+    if start_date:
+        lines.append(f"Start Date: {start_date}")
+    if due_date:
+        lines.append(f"Due Date: {due_date}")
     
     # Add priority if available
-    priority_map = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
-    priority = task.get('priority', 0)
-    formatted += f"Priority: {priority_map.get(priority, str(priority))}\n"
+    lines.append(f"Priority: {PRIORITY_MAP.get(priority, str(priority))}")
     
     # Add status if available
-    status = "Completed" if task.get('status') == 2 else "Active"
-    formatted += f"Status: {status}\n"
+    lines.append(f"Status: {'Completed' if status == 2 else 'Active'}")
     
     # Add content if available
-    if task.get('content'):
-        formatted += f"\nContent:\n{task.get('content')}\n"
+    if content:
+        lines.extend(["", "Content:", content])
     
     # Add subtasks if available
-    items = task.get('items', [])
     if items:
-        formatted += f"\nSubtasks ({len(items)}):\n"
-        for i, item in enumerate(items, 1):
-            status = "✓" if item.get('status') == 1 else "□"
-            formatted += f"{i}. [{status}] {item.get('title', 'No title')}\n"
+        lines.extend(["", f"Subtasks ({len(items)}):"])
+        for i, (item_title, item_status) in enumerate(items, 1):
+            mark = "✓" if item_status == 1 else "□"
+            lines.append(f"{i}. [{mark}] {item_title}")
     
-    return formatted
+    return "\n".join(lines) + "\n"
+
+# Marks a project field that is absent, as opposed to present with a None value
+_MISSING = object()
 
 # Format a project object from TickTick for better display
 def format_project(project: Dict) -> str:
     """Format a project into a human-readable string."""
-    formatted = f"Name: {project.get('name', 'No name')}\n"
-    formatted += f"ID: {project.get('id', 'No ID')}\n"
+    fields = (
+        project.get('name', 'No name'),
+        project.get('id', 'No ID'),
+        project.get('color'),
+        project.get('viewMode'),
+        project.get('closed', _MISSING),
+        project.get('kind'),
+    )
+    try:
+        return _format_project_fields(*fields)
+    except TypeError:
+        # Unhashable field values can't be cached; format them directly
+        return _format_project_fields.__wrapped__(*fields)
+
+# Projects rarely change between calls, so their text is reused
+@lru_cache(maxsize=512)
+def _format_project_fields(name, project_id, color, view_mode, closed, kind) -> str:
+    """Format the project fields used by format_project."""
+    lines = [
+        f"Name: {name}",
+        f"ID: {project_id}",
+    ]
     
     # Add color if available
-    if project.get('color'):
-        formatted += f"Color: {project.get('color')}\n"
+    if color:
+        lines.append(f"Color: {color}")
     
     # Add view mode if available
-    if project.get('viewMode'):
-        formatted += f"View Mode: {project.get('viewMode')}\n"
+    if view_mode:
+        lines.append(f"View Mode: {view_mode}")
     
     # Add closed status if available
-    if 'closed' in project:
-        formatted += f"Closed: {'Yes' if project.get('closed') else 'No'}\n"
+    if closed is not _MISSING:
+        lines.append(f"Closed: {'Yes' if closed else 'No'}")
     
     # Add kind if available
-    if project.get('kind'):
-        formatted += f"Kind: {project.get('kind')}\n"
+    if kind:
+        lines.append(f"Kind: {kind}")
     
-    return formatted
+    return "\n".join(lines) + "\n"
 
 # MCP Tools
 
 @mcp.tool()
+@requires_client
 async def get_projects() -> str:
     """
     Get all projects from TickTick.
@@ -123,28 +362,25 @@ async def get_projects() -> str:
     Example:
         Use this to see all available projects before creating tasks or filtering by project.
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        projects = ticktick.get_projects()
+        projects = await cached_get_projects()
         if 'error' in projects:
-            return f"Error fetching projects: {projects['error']}"
+            return ToolResult(f"Error fetching projects: {projects['error']}", "api_error")
         
         if not projects:
-            return "No projects found."
+            return ToolResult("No projects found.")
         
-        result = f"Found {len(projects)} projects:\n\n"
+        parts = [f"Found {len(projects)} projects:\n\n"]
         for i, project in enumerate(projects, 1):
-            result += f"Project {i}:\n" + format_project(project) + "\n"
+            parts.extend((f"Project {i}:\n", format_project(project), "\n"))
         
-        return result
+        return ToolResult("".join(parts))
     except Exception as e:
         logger.error(f"Error in get_projects: {e}")
-        return f"Error retrieving projects: {str(e)}"
+        return ToolResult(f"Error retrieving projects: {str(e)}", "exception")
 
 @mcp.tool()
+@requires_client
 async def get_project(project_id: str) -> str:
     """
     Get details about a specific project.
@@ -158,12 +394,8 @@ async def get_project(project_id: str) -> str:
     Example:
         get_project("6226ff9877acee87727f6bca") - Get details for a specific project
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        project = ticktick.get_project(project_id)
+        project = await _call_api(ticktick.get_project, project_id)
         if 'error' in project:
             return f"Error fetching project: {project['error']}"
         
@@ -173,6 +405,7 @@ async def get_project(project_id: str) -> str:
         return f"Error retrieving project: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def get_project_tasks(project_id: str) -> str:
     """
     Get all tasks in a specific project.
@@ -187,29 +420,26 @@ async def get_project_tasks(project_id: str) -> str:
         get_project_tasks("inbox") - Get all tasks in your inbox
         get_project_tasks("6226ff9877acee87727f6bca") - Get all tasks in a specific project
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        project_data = ticktick.get_project_with_data(project_id)
+        project_data = await cached_get_project_with_data(project_id)
         if 'error' in project_data:
-            return f"Error fetching project data: {project_data['error']}"
+            return ToolResult(f"Error fetching project data: {project_data['error']}", "api_error")
         
         tasks = project_data.get('tasks', [])
         if not tasks:
-            return f"No tasks found in project '{project_data.get('project', {}).get('name', project_id)}'."
+            return ToolResult(f"No tasks found in project '{project_data.get('project', {}).get('name', project_id)}'.")
         
-        result = f"Found {len(tasks)} tasks in project '{project_data.get('project', {}).get('name', project_id)}':\n\n"
+        parts = [f"Found {len(tasks)} tasks in project '{project_data.get('project', {}).get('name', project_id)}':\n\n"]
         for i, task in enumerate(tasks, 1):
-            result += f"Task {i}:\n" + format_task(task) + "\n"
+            parts.extend((f"Task {i}:\n", format_task(task), "\n"))
         
-        return result
+        return ToolResult("".join(parts))
     except Exception as e:
         logger.error(f"Error in get_project_tasks: {e}")
-        return f"Error retrieving project tasks: {str(e)}"
+        return ToolResult(f"Error retrieving project tasks: {str(e)}", "exception")
 
 @mcp.tool()
+@requires_client
 async def get_task(project_id: str, task_id: str) -> str:
     """
     Get details about a specific task.
@@ -224,12 +454,8 @@ async def get_task(project_id: str, task_id: str) -> str:
     Example:
         get_task("inbox", "63b7bebb91c0a5474805fcd4") - Get details for a specific task
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        task = ticktick.get_task(project_id, task_id)
+        task = await _call_api(ticktick.get_task, project_id, task_id)
         if 'error' in task:
             return f"Error fetching task: {task['error']}"
         
@@ -239,6 +465,7 @@ async def get_task(project_id: str, task_id: str) -> str:
         return f"Error retrieving task: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def create_task(
     title: str, 
     project_id: str, 
@@ -271,25 +498,19 @@ async def create_task(
     Example:
         create_task("Buy groceries", "inbox", priority=3, due_date="2025-11-05T18:00:00+0000")
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     # Validate priority
-    if priority not in [0, 1, 3, 5]:
+    if priority not in _VALID_PRIORITIES:
         return "Invalid priority. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)."
     
     try:
         # Validate dates if provided
         for date_str, date_name in [(start_date, "start_date"), (due_date, "due_date")]:
             if date_str:
-                try:
-                    # Try to parse the date to validate it
-                    datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                except ValueError:
+                if not _is_valid_iso_date(date_str):
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.create_task(
+        task = await _call_api(
+            ticktick.create_task,
             title=title,
             project_id=project_id,
             content=content,
@@ -297,6 +518,7 @@ async def create_task(
             due_date=due_date,
             priority=priority
         )
+        _invalidate_cache(project_id)
         
         if 'error' in task:
             return f"Error creating task: {task['error']}"
@@ -307,6 +529,7 @@ async def create_task(
         return f"Error creating task: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def update_task(
     task_id: str,
     project_id: str,
@@ -338,25 +561,19 @@ async def update_task(
     Example:
         update_task("63b7bebb91c0a5474805fcd4", "inbox", priority=5) - Update task priority to high
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     # Validate priority if provided
-    if priority is not None and priority not in [0, 1, 3, 5]:
+    if priority is not None and priority not in _VALID_PRIORITIES:
         return "Invalid priority. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)."
     
     try:
         # Validate dates if provided
         for date_str, date_name in [(start_date, "start_date"), (due_date, "due_date")]:
             if date_str:
-                try:
-                    # Try to parse the date to validate it
-                    datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                except ValueError:
+                if not _is_valid_iso_date(date_str):
                     return f"Invalid {date_name} format. Use ISO format: YYYY-MM-DDThh:mm:ss+0000"
         
-        task = ticktick.update_task(
+        task = await _call_api(
+            ticktick.update_task,
             task_id=task_id,
             project_id=project_id,
             title=title,
@@ -365,6 +582,7 @@ async def update_task(
             due_date=due_date,
             priority=priority
         )
+        _invalidate_cache(project_id)
         
         if 'error' in task:
             return f"Error updating task: {task['error']}"
@@ -375,6 +593,7 @@ async def update_task(
         return f"Error updating task: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def complete_task(project_id: str, task_id: str) -> str:
     """
     Mark a task as complete.
@@ -389,12 +608,9 @@ async def complete_task(project_id: str, task_id: str) -> str:
     Example:
         complete_task("inbox", "63b7bebb91c0a5474805fcd4") - Mark a task as done
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        result = ticktick.complete_task(project_id, task_id)
+        result = await _call_api(ticktick.complete_task, project_id, task_id)
+        _invalidate_cache(project_id)
         if 'error' in result:
             return f"Error completing task: {result['error']}"
         
@@ -404,6 +620,7 @@ async def complete_task(project_id: str, task_id: str) -> str:
         return f"Error completing task: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def delete_task(project_id: str, task_id: str) -> str:
     """
     Delete a task permanently.
@@ -421,12 +638,9 @@ async def delete_task(project_id: str, task_id: str) -> str:
     Example:
         delete_task("inbox", "63b7bebb91c0a5474805fcd4") - Delete a task permanently
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        result = ticktick.delete_task(project_id, task_id)
+        result = await _call_api(ticktick.delete_task, project_id, task_id)
+        _invalidate_cache(project_id)
         if 'error' in result:
             return f"Error deleting task: {result['error']}"
         
@@ -436,6 +650,7 @@ async def delete_task(project_id: str, task_id: str) -> str:
         return f"Error deleting task: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def create_project(
     name: str,
     color: str = "#F18181",
@@ -458,20 +673,18 @@ async def create_project(
     Example:
         create_project("Work Tasks", color="#5AC8FA", view_mode="kanban")
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     # Validate view_mode
-    if view_mode not in ["list", "kanban", "timeline"]:
+    if view_mode not in _VALID_VIEW_MODES:
         return "Invalid view_mode. Must be one of: list, kanban, timeline."
     
     try:
-        project = ticktick.create_project(
+        project = await _call_api(
+            ticktick.create_project,
             name=name,
             color=color,
             view_mode=view_mode
         )
+        _invalidate_cache(projects=True)
         
         if 'error' in project:
             return f"Error creating project: {project['error']}"
@@ -482,6 +695,7 @@ async def create_project(
         return f"Error creating project: {str(e)}"
 
 @mcp.tool()
+@requires_client
 async def delete_project(project_id: str) -> str:
     """
     Delete a project permanently.
@@ -498,12 +712,9 @@ async def delete_project(project_id: str) -> str:
     Example:
         delete_project("6226ff9877acee87727f6bca") - Delete a project
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     try:
-        result = ticktick.delete_project(project_id)
+        result = await _call_api(ticktick.delete_project, project_id)
+        _invalidate_cache(project_id, projects=True)
         if 'error' in result:
             return f"Error deleting project: {result['error']}"
         
@@ -518,6 +729,8 @@ async def delete_project(project_id: str) -> str:
 # Helper Functions
 
 PRIORITY_MAP = {0: "None", 1: "Low", 3: "Medium", 5: "High"}
+# filter_tasks descriptions for each priority filter
+_PRIORITY_LABELS = {priority: f"priority {name}" for priority, name in PRIORITY_MAP.items()}
 
 def _parse_ticktick_date(date_str: str) -> Optional[datetime]:
     """
@@ -532,44 +745,39 @@ def _parse_ticktick_date(date_str: str) -> Optional[datetime]:
     Returns:
         datetime object with timezone, or None if parsing fails
     """
-    if not date_str:
+    if not date_str or not isinstance(date_str, str):
         return None
-    
+    return _parse_ticktick_date_cached(date_str)
+
+# The same due dates recur across tasks and repeated filter_tasks calls, and
+# datetimes are immutable, so parsed results are safe to share
+@lru_cache(maxsize=4096)
+def _parse_ticktick_date_cached(date_str: str) -> Optional[datetime]:
+    """Parse a non-empty TickTick date string (see _parse_ticktick_date)."""
     try:
-        # Try parsing with microseconds first (in case API changes)
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%dT%H:%M:%S.%f%z")
-        except ValueError:
-            pass
-        
-        # Normalize timezone format: +0000 -> +00:00 for Python's strptime
-        # Python's %z expects +00:00 format, not +0000
-        normalized_date = date_str
-        if len(date_str) > 5 and date_str[-5] in ['+', '-']:
-            # Format: YYYY-MM-DDTHH:MM:SS+0000 -> YYYY-MM-DDTHH:MM:SS+00:00
-            timezone_part = date_str[-5:]
-            if len(timezone_part) == 5 and timezone_part[-4:].isdigit():
-                sign = timezone_part[0]
-                hours = timezone_part[1:3]
-                minutes = timezone_part[3:5]
-                normalized_date = date_str[:-5] + f"{sign}{hours}:{minutes}"
-        
-        # Try parsing without microseconds
-        try:
-            return datetime.strptime(normalized_date, "%Y-%m-%dT%H:%M:%S%z")
-        except ValueError:
-            # Fallback: try with fromisoformat which handles both formats
-            try:
-                # Convert +0000 to +00:00 for fromisoformat
-                if normalized_date.endswith(('+0000', '-0000')):
-                    sign = normalized_date[-5]
-                    normalized_date = normalized_date[:-5] + f"{sign}00:00"
-                return datetime.fromisoformat(normalized_date.replace('Z', '+00:00'))
-            except (ValueError, AttributeError):
-                return None
-    except (ValueError, TypeError, AttributeError):
+        # fromisoformat (Python 3.10) needs the offset as +00:00, not Z or +0000
+        normalized_date = _TZ_FIX.sub(r'\1\2:\3', date_str.replace('Z', '+00:00'))
+        return datetime.fromisoformat(normalized_date)
+    except ValueError:
         return None
 
+def _is_valid_iso_date(date_str: str) -> bool:
+    """
+    Check that a date string supplied to a task tool is a valid ISO date.
+    
+    Accepts Z, +0000 and +00:00 offsets on a date-time as well as values
+    without one; a date without a time can't carry an offset.
+    Malformed strings are rejected by the regex before attempting a parse.
+    """
+    if not _ISO_RE.match(date_str):
+        return False
+    try:
+        normalized_date = date_str.replace('Z', '+00:00').replace('z', '+00:00')
+        datetime.fromisoformat(_TZ_FIX.sub(r'\1\2:\3', normalized_date))
+    except ValueError:
+        return False
+    return True
+
 def _to_local_date(task_dt: datetime) -> date:
     """
     Convert a datetime (with timezone) to local date.
@@ -584,89 +792,117 @@ def _to_local_date(task_dt: datetime) -> date:
         return task_dt.astimezone().date()
     return task_dt.date()
 
-def _is_task_due_today(task: Dict[str, Any]) -> bool:
-    """Check if a task is due or starts today."""
-    # Check both dueDate and startDate (calendar events often only have startDate)
-    today_date = datetime.now().date()
-    for date_field in ['dueDate', 'startDate']:
-        date_str = task.get(date_field)
-        if date_str:
-            task_dt = _parse_ticktick_date(date_str)
-            if task_dt:
-                task_date = _to_local_date(task_dt)
-                if task_date == today_date:
-                    return True
-    return False
+class TaskRecord:
+    """
+    The task fields the filters read, pulled out of a task dictionary once.
+    
+    Filters run over every task on every filter_tasks call, so they read
+    slot attributes (with defaults already applied) rather than repeating
+    dict lookups. Text fields are stored casefolded for case-insensitive
+    search. The original dictionary is kept in `task` for output.
+    """
+    __slots__ = ('task', 'priority', 'due_date', 'start_date', 'title_cf', 'content_cf', 'subtask_titles_cf')
+    
+    def __init__(self, task: Dict[str, Any]):
+        _get = task.get
+        self.task = task
+        self.priority = _get('priority', 0)
+        self.due_date = _get('dueDate')
+        self.start_date = _get('startDate')
+        self.title_cf = (_get('title') or '').casefold()
+        self.content_cf = (_get('content') or '').casefold()
+        self.subtask_titles_cf = tuple((item.get('title') or '').casefold() for item in _get('items') or ())
 
-def _is_task_overdue(task: Dict[str, Any]) -> bool:
-    """Check if a task is overdue."""
-    now_local = datetime.now(timezone.utc).astimezone()
-    # For overdue, we primarily check dueDate (if present)
-    # If only startDate exists, we check if it's in the past
-    due_date = task.get('dueDate')
-    if due_date:
-        task_dt = _parse_ticktick_date(due_date)
-        if task_dt:
-            # Convert task datetime to local timezone for comparison
-            if task_dt.tzinfo:
-                task_dt_local = task_dt.astimezone()
-            else:
-                # If naive, assume it's UTC and convert to local
-                task_dt_local = task_dt.replace(tzinfo=timezone.utc).astimezone()
-            return task_dt_local < now_local
+class _TaskIndex(NamedTuple):
+    """A project's task records, grouped by priority, built from one project data response."""
+    source: Dict
+    records: List[TaskRecord]
+    by_priority: Dict[int, List[TaskRecord]]
+
+# Task indexes for cached project data, keyed like the cache entries they
+# were built from and dropped along with them
+_task_indexes: Dict[str, _TaskIndex] = {}
+
+def _get_task_records(project_id: str, project_data: Dict, priority: Optional[int] = None) -> List[TaskRecord]:
+    """
+    Return the TaskRecords for a project's data, building them on first use.
     
-    # If no dueDate but has startDate, check if startDate is in the past
-    start_date = task.get('startDate')
-    if start_date:
-        task_dt = _parse_ticktick_date(start_date)
-        if task_dt:
-            # Convert task datetime to local timezone for comparison
-            if task_dt.tzinfo:
-                task_dt_local = task_dt.astimezone()
-            else:
-                # If naive, assume it's UTC and convert to local
-                task_dt_local = task_dt.replace(tzinfo=timezone.utc).astimezone()
-            return task_dt_local < now_local
+    The records are indexed per cache entry, so they are built once per fetch
+    and rebuilt when the project data is refetched. filter_tasks calls this
+    from worker threads; an index is only used for the exact project_data it
+    was built from, so a racing rebuild or invalidation can't serve stale records.
     
-    return False
-
-def _is_task_due_in_days(task: Dict[str, Any], days: int) -> bool:
-    """Check if a task is due or starts in exactly X days."""
-    target_date = (datetime.now() + timedelta(days=days)).date()
+    Args:
+        project_id: ID the project data was fetched with
+        project_data: Response from get_project_with_data
+        priority: If given, return only the records with this priority
     
+    Returns:
+        The matching records, in the order of the response's tasks
+    """
+    key = f"project_data:{project_id}"
+    index = _task_indexes.get(key)
+    if index is None or index.source is not project_data:
+        records = [TaskRecord(task) for task in project_data.get('tasks') or []]
+        by_priority: Dict[int, List[TaskRecord]] = {}
+        for record in records:
+            by_priority.setdefault(record.priority, []).append(record)
+        index = _TaskIndex(project_data, records, by_priority)
+        _task_indexes[key] = index
+    
+    if priority is None:
+        return index.records
+    return index.by_priority.get(priority, [])
+
+# Task dates repeat across tasks and calls, and an instant's local date only
+# changes with the machine's timezone, so conversions are cached per string
+@lru_cache(maxsize=4096)
+def _task_local_date(date_str: str) -> Optional[date]:
+    """Parse a TickTick date string and return its local date, or None if invalid."""
+    task_dt = _parse_ticktick_date(date_str)
+    return _to_local_date(task_dt) if task_dt else None
+
+def _is_task_due_between(record: TaskRecord, start: date, end: date) -> bool:
+    """Check if a task is due or starts between two local dates (inclusive)."""
+    _local_date = _task_local_date
     # Check both dueDate and startDate (calendar events often only have startDate)
-    for date_field in ['dueDate', 'startDate']:
-        date_str = task.get(date_field)
+    for date_str in (record.due_date, record.start_date):
+        if date_str and isinstance(date_str, str):
+            task_date = _local_date(date_str)
+            if task_date and start <= task_date <= end:
+                return True
+    return False
+
+def _is_task_overdue(record: TaskRecord, now_local: datetime) -> bool:
+    """Check if a task is overdue as of now_local (an aware local datetime)."""
+    # For overdue, we primarily check dueDate (if present)
+    # If only startDate exists, we check if it's in the past
+    for date_str in (record.due_date, record.start_date):
         if date_str:
             task_dt = _parse_ticktick_date(date_str)
             if task_dt:
-                task_date = _to_local_date(task_dt)
-                if task_date == target_date:
-                    return True
+                # Aware datetimes compare as instants, so no conversion is needed
+                if not task_dt.tzinfo:
+                    # If naive, assume it's UTC
+                    task_dt = task_dt.replace(tzinfo=timezone.utc)
+                return task_dt < now_local
+    
     return False
 
-def _task_matches_search(task: Dict[str, Any], search_term: str) -> bool:
-    """Check if a task matches the search term (case-insensitive)."""
-    search_term = search_term.lower()
-    
-    # Search in title
-    title = task.get('title', '').lower()
-    if search_term in title:
-        return True
+def _task_matches_search(record: TaskRecord, search_cf: str) -> bool:
+    """
+    Check if a task matches the search term (case-insensitive).
     
-    # Search in content
-    content = task.get('content', '').lower()
-    if search_term in content:
+    Args:
+        record: Task to check
+        search_cf: Search term, already casefolded by the caller
+    """
+    # Search title, then content, against the record's casefolded copies
+    if search_cf in record.title_cf or search_cf in record.content_cf:
         return True
     
     # Search in subtasks
-    items = task.get('items', [])
-    for item in items:
-        item_title = item.get('title', '').lower()
-        if search_term in item_title:
-            return True
-    
-    return False
+    return any(search_cf in title for title in record.subtask_titles_cf)
 
 def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[str]:
     """
@@ -684,37 +920,132 @@ def _validate_task_data(task_data: Dict[str, Any], task_index: int) -> Optional[
     
     # Validate priority if provided
     priority = task_data.get('priority')
-    if priority is not None and priority not in [0, 1, 3, 5]:
+    if priority is not None and priority not in _VALID_PRIORITIES:
         return f"Task {task_index + 1}: Invalid priority {priority}. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)"
     
     # Validate dates if provided
     for date_field in ['start_date', 'due_date']:
         date_str = task_data.get(date_field)
         if date_str:
-            try:
-                # Try to parse the date to validate it
-                # Handle both with and without timezone info
-                if date_str.endswith('Z'):
-                    datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-                elif '+' in date_str or date_str.endswith(('00', '30')):
-                    datetime.fromisoformat(date_str)
-                else:
-                    # Assume local timezone if no timezone specified
-                    datetime.fromisoformat(date_str)
-            except ValueError:
+            if not _is_valid_iso_date(date_str):
                 return f"Task {task_index + 1}: Invalid {date_field} format '{date_str}'. Use ISO format: YYYY-MM-DDTHH:mm:ss or with timezone"
     
     return None
 
-def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name: str, include_inbox: bool = True) -> str:
+TaskPredicate = Callable[[TaskRecord], bool]
+
+def _match_all(record: TaskRecord) -> bool:
+    """Predicate for a filter that is not in use."""
+    return True
+
+class _DateContext(NamedTuple):
+    """Reference times for the date filters, resolved once per filter_tasks call."""
+    now_local: datetime
+    today: date
+    tomorrow: date
+    week_end: date
+
+# Task matcher for each date_filter value, called as matcher(record, context)
+_DATE_MATCHERS: Dict[str, Callable[[TaskRecord, _DateContext], bool]] = {
+    "all": lambda record, ctx: True,
+    "today": lambda record, ctx: _is_task_due_between(record, ctx.today, ctx.today),
+    "tomorrow": lambda record, ctx: _is_task_due_between(record, ctx.tomorrow, ctx.tomorrow),
+    "overdue": lambda record, ctx: _is_task_overdue(record, ctx.now_local),
+    "this_week": lambda record, ctx: _is_task_due_between(record, ctx.today, ctx.week_end),
+    "next_7_days": lambda record, ctx: _is_task_due_between(record, ctx.today, ctx.week_end),
+}
+
+def _make_search_predicate(search_term: Optional[str]) -> TaskPredicate:
+    """Build the search predicate, or _match_all when there is no search term."""
+    if search_term is None:
+        return _match_all
+    
+    search_cf = search_term.casefold()
+    # Bind the matcher as a default so each call is a local lookup
+    return lambda record, _matches=_task_matches_search: _matches(record, search_cf)
+
+def _make_task_filter(date_filter: str, search_term: Optional[str]) -> TaskPredicate:
+    """
+    Build the task predicate used by filter_tasks.
+    
+    Priority is not part of the predicate: filter_tasks selects tasks of the
+    requested priority through the project's task index (see _get_task_records).
+    
+    Args:
+        date_filter: One of the date_filter values accepted by filter_tasks
+        search_term: Text to search for, or None to skip searching
+    
+    Returns:
+        Function that takes a TaskRecord and returns True if it matches all filters
+    
+    Raises:
+        ValueError: If date_filter is not a known filter
+    """
+    search_pred = _make_search_predicate(search_term)
+    
+    matcher = _DATE_MATCHERS.get(date_filter)
+    if matcher is None:
+        raise ValueError(f"Unknown date_filter: {date_filter!r}")
+    
+    # Date predicates depend on the current time, so they are bound per call,
+    # resolving the time once per filter rather than once per task
+    date_pred = _match_all
+    if date_filter != "all":
+        now_local = datetime.now(timezone.utc).astimezone()
+        today = now_local.date()
+        ctx = _DateContext(now_local, today, today + timedelta(days=1), today + timedelta(days=7))
+        date_pred = lambda record, _match=matcher, _ctx=ctx: _match(record, _ctx)
+    
+    # Compose only the filters in use, cheapest first: date parsing, then the
+    # text scan, so short-circuiting skips the scan for tasks with the wrong date
+    predicates = [pred for pred in (date_pred, search_pred) if pred is not _match_all]
+    
+    if not predicates:
+        return _match_all
+    if len(predicates) == 1:
+        return predicates[0]
+    
+    chain = tuple(predicates)
+    
+    def task_filter(record: TaskRecord) -> bool:
+        for pred in chain:
+            if not pred(record):
+                return False
+        return True
+    
+    return task_filter
+
+# The same few filter combinations (e.g. from the GTD prompts) recur, so
+# their descriptions are built once
+@lru_cache(maxsize=256)
+def _describe_filter(date_filter: str, priority: Optional[int], search_term: Optional[str],
+                     project_id: Optional[str]) -> str:
+    """Describe a filter_tasks filter for its output, e.g. "today and priority High"."""
+    filter_parts = []
+    if date_filter != "all":
+        filter_parts.append(date_filter)
+    if priority is not None:
+        filter_parts.append(_PRIORITY_LABELS[priority])
+    if search_term:
+        filter_parts.append(f"matching '{search_term}'")
+    if project_id:
+        filter_parts.append(f"in project '{project_id}'")
+    
+    return " and ".join(filter_parts) if filter_parts else "all tasks"
+
+async def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name: str,
+                                       include_inbox: bool = True, priority: Optional[int] = None,
+                                       limit: Optional[int] = None) -> str:
     """
     Helper function to filter tasks across all projects.
     
     Args:
         projects: List of project dictionaries
-        filter_func: Function that takes a task and returns True if it matches the filter
+        filter_func: Function that takes a TaskRecord and returns True if it matches the filter
         filter_name: Name of the filter for output formatting
         include_inbox: Whether to include inbox tasks (default True)
+        priority: If given, only tasks with this priority are passed to filter_func
+        limit: Maximum number of matching tasks to list across all projects, or None for all
     
     Returns:
         Formatted string of filtered tasks
@@ -740,51 +1071,110 @@ def _get_project_tasks_by_filter(projects: List[Dict], filter_func, filter_name:
             '_synthetic': True  # Mark as synthetic so we know to use special handling
         })
     
-    result = f"Found {len(projects_to_process)} projects:\n\n"
+    # Fetch all open projects concurrently (_call_api bounds the number in flight)
+    # and filter each one's tasks as soon as its data arrives
+    open_projects = [(i, p) for i, p in enumerate(projects_to_process, 1) if not p.get('closed')]
     
-    for i, project in enumerate(projects_to_process, 1):
-        if project.get('closed'):
-            continue
-            
+    async def fetch_and_filter(pos: int, project: Dict) -> Tuple[int, Optional[Tuple[Dict, List[TaskRecord]]]]:
         project_id = project.get('id', 'No ID')
-        project_data = ticktick.get_project_with_data(project_id)
-        
-        # Handle error responses (e.g., if inbox doesn't exist for this user)
-        if 'error' in project_data:
-            logger.debug(f"Error fetching project {project_id}: {project_data.get('error')}")
-            continue
+        try:
+            project_data = await cached_get_project_with_data(project_id)
             
-        tasks = project_data.get('tasks', [])
-        
-        # Get the actual project info from the response if available
-        actual_project = project_data.get('project', project)
-        
-        if not tasks:
-            result += f"Project {i}:\n{format_project(actual_project)}"
-            result += f"With 0 tasks that are to be '{filter_name}' in this project :\n\n\n"
+            # Handle error responses (e.g., if inbox doesn't exist for this user)
+            if 'error' in project_data:
+                logger.debug(f"Error fetching project {project_id}: {project_data.get('error')}")
+                return pos, None
+            
+            # Build and filter the records in a worker thread, so the per-task work
+            # overlaps the fetches still in flight instead of stalling the event loop
+            matches = await asyncio.to_thread(_filter_task_records, project_id, project_data, filter_func, priority)
+            return pos, (project_data, matches)
+        except Exception as e:
+            # One failing project shouldn't lose the results from the others
+            logger.warning(f"Skipping project {project_id} after error: {e}")
+            return pos, None
+    
+    # Fetches complete in any order; slot the results back into project order
+    results: List[Optional[Tuple[Dict, List[TaskRecord]]]] = [None] * len(open_projects)
+    for next_done in asyncio.as_completed(
+        [fetch_and_filter(pos, p) for pos, (_, p) in enumerate(open_projects)]
+    ):
+        pos, result = await next_done
+        results[pos] = result
+    
+    # Format in project order, only up to `limit` tasks in total
+    parts = [f"Found {len(projects_to_process)} projects:\n\n"]
+    remaining = limit
+    total_matches = 0
+    for (i, project), result in zip(open_projects, results):
+        if result is None:
             continue
-        
-        # Filter tasks using the provided function
-        filtered_tasks = [(t, task) for t, task in enumerate(tasks, 1) if filter_func(task)]
-        
-        result += f"Project {i}:\n{format_project(actual_project)}"
-        result += f"With {len(filtered_tasks)} tasks that are to be '{filter_name}' in this project :\n"
-        
-        for t, task in filtered_tasks:
-            result += f"Task {t}:\n{format_task(task)}\n"
-        
-        result += "\n\n"
+        project_data, matches = result
+        parts.append(_format_filtered_project(i, project, project_data, matches, filter_name, remaining))
+        total_matches += len(matches)
+        if remaining is not None:
+            remaining = max(remaining - len(matches), 0)
+    
+    parts.append(_truncation_note(total_matches, limit))
+    return "".join(parts)
+
+def _filter_task_records(project_id: str, project_data: Dict, filter_func,
+                         priority: Optional[int] = None) -> List[TaskRecord]:
+    """Return a project's task records that pass filter_func (and have the given priority, if any)."""
+    return [record for record in _get_task_records(project_id, project_data, priority) if filter_func(record)]
+
+def _format_filtered_project(i: int, project: Dict, project_data: Dict, matches: List[TaskRecord],
+                             filter_name: str, limit: Optional[int] = None) -> str:
+    """
+    Format one project's section of the filter_tasks output.
+    
+    Args:
+        i: Position of the project in the listing
+        project: Project dictionary from the project list
+        project_data: Response from get_project_with_data for the project
+        matches: The project's task records that matched the filter
+        filter_name: Name of the filter for output formatting
+        limit: Maximum number of matching tasks to format, or None for all
+    
+    Returns:
+        Formatted section listing the matching tasks
+    """
+    # Get the actual project info from the response if available
+    actual_project = project_data.get('project', project)
+    
+    listed = matches if limit is None else matches[:limit]
+    # Say how many are listed when the overall limit cut this project short
+    shown = f", first {len(listed)} listed" if len(listed) < len(matches) else ""
     
-    return result
+    parts = [
+        f"Project {i}:\n", format_project(actual_project),
+        f"With {len(matches)} tasks that are to be '{filter_name}' in this project{shown} :\n"
+    ]
+    
+    _extend = parts.extend
+    _format = format_task
+    for n, record in enumerate(listed, 1):
+        _extend((f"Task {n}:\n", _format(record.task), "\n"))
+    
+    parts.append("\n\n")
+    return "".join(parts)
+
+def _truncation_note(total_matches: int, limit: Optional[int]) -> str:
+    """Footer for filter_tasks output when more tasks matched than were listed."""
+    if limit is None or total_matches <= limit:
+        return ""
+    return f"... ({total_matches} matching tasks, truncated to {limit}; pass limit=N for more)\n"
 
 # Task Filtering Tool
 
 @mcp.tool()
+@requires_client
 async def filter_tasks(
     date_filter: str = "all",
     priority: int = None,
     search_term: str = None,
-    project_id: str = None
+    project_id: str = None,
+    limit: int = 200
 ) -> str:
     """
     Filter tasks across all projects with flexible criteria. Combine multiple filters to find exactly what you need.
@@ -807,6 +1197,8 @@ async def filter_tasks(
             Example: "client meeting" will find tasks containing "client meeting"
         project_id: Filter to a specific project. Use "inbox" for inbox tasks, or a project ID.
             If None, searches across all projects.
+        limit: Maximum number of matching tasks to list (default 200). If more tasks
+            match, the output ends with a note saying how many matched.
     
     Returns:
         Formatted list of matching tasks grouped by project.
@@ -819,120 +1211,89 @@ async def filter_tasks(
         filter_tasks(project_id="inbox", date_filter="this_week") - Inbox tasks due this week
         filter_tasks(priority=3, search_term="review") - Medium priority tasks containing "review"
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     # Validate date_filter
-    valid_date_filters = ["all", "today", "tomorrow", "overdue", "this_week", "next_7_days"]
-    if date_filter not in valid_date_filters:
-        return f"Invalid date_filter. Valid values: {', '.join(valid_date_filters)}"
+    if date_filter not in _VALID_DATE_FILTERS:
+        return ToolResult(f"Invalid date_filter. Valid values: {_VALID_DATE_FILTERS_TEXT}", "invalid_date_filter")
     
     # Validate priority if provided
-    if priority is not None and priority not in PRIORITY_MAP:
-        return f"Invalid priority. Valid values: {list(PRIORITY_MAP.keys())}"
+    if priority is not None and priority not in _VALID_PRIORITIES:
+        return ToolResult(f"Invalid priority. Valid values: {_VALID_PRIORITIES_TEXT}", "invalid_priority")
     
     # Validate search_term if provided
     if search_term is not None and not search_term.strip():
-        return "Search term cannot be empty."
+        return ToolResult("Search term cannot be empty.", "invalid_search_term")
+    
+    # Validate limit
+    if limit < 1:
+        return ToolResult("Invalid limit. Must be at least 1.", "invalid_limit")
     
+    # The priority filter is applied through each project's priority index
+    # (see _get_task_records) rather than by the task filter, so the other
+    # filters only run on tasks that already have the right priority
     try:
-        # Get projects to filter
         if project_id:
-            # Single project filter
-            if project_id.lower() == "inbox":
-                # Special handling for inbox - don't search in projects list
-                # Just create a synthetic project entry that will be fetched
-                projects = [{'id': 'inbox', 'name': 'Inbox'}]
+            # Single project filter: fetch and filter just that project's data,
+            # without listing the other projects
+            fetch_id = 'inbox' if project_id.lower() == "inbox" else project_id
+            project_data = await cached_get_project_with_data(fetch_id)
+            if fetch_id == 'inbox':
+                # Special handling for inbox - it isn't in the projects list, and
+                # a failed fetch just yields no tasks
+                project = {'id': 'inbox', 'name': 'Inbox'}
             else:
-                projects_data = ticktick.get_projects()
-                if 'error' in projects_data:
-                    return f"Error fetching projects: {projects_data['error']}"
-                
-                # Find the specific project
-                project = None
-                for p in projects_data:
-                    if p.get('id') == project_id:
-                        project = p
-                        break
+                if 'error' in project_data:
+                    if project_data.get('status_code') == 404:
+                        return ToolResult(f"Project '{project_id}' not found.", "project_not_found")
+                    return ToolResult(f"Error fetching project data: {project_data['error']}", "api_error")
                 
-                if not project:
-                    return f"Project '{project_id}' not found."
-                
-                projects = [project]
-        else:
-            # All projects
-            projects = ticktick.get_projects()
-            if 'error' in projects:
-                return f"Error fetching projects: {projects['error']}"
-        
-        # Build filter function
-        def task_filter(task: Dict[str, Any]) -> bool:
-            # Date filter
-            if date_filter == "all":
-                date_match = True
-            elif date_filter == "today":
-                date_match = _is_task_due_today(task)
-            elif date_filter == "tomorrow":
-                date_match = _is_task_due_in_days(task, 1)
-            elif date_filter == "overdue":
-                date_match = _is_task_overdue(task)
-            elif date_filter in ["this_week", "next_7_days"]:
-                # Check both dueDate and startDate (calendar events often only have startDate)
-                today = datetime.now().date()
-                week_from_today = today + timedelta(days=7)
-                date_match = False
-                
-                for date_field in ['dueDate', 'startDate']:
-                    date_str = task.get(date_field)
-                    if date_str:
-                        task_dt = _parse_ticktick_date(date_str)
-                        if task_dt:
-                            task_date = _to_local_date(task_dt)
-                            if today <= task_date <= week_from_today:
-                                date_match = True
-                                break
-            else:
-                date_match = True
-            
-            # Priority filter
-            if priority is None:
-                priority_match = True
-            else:
-                priority_match = task.get('priority', 0) == priority
+                project = project_data.get('project') or {'id': project_id}
             
-            # Search filter
-            if search_term is None:
-                search_match = True
-            else:
-                search_match = _task_matches_search(task, search_term)
+            task_filter = _make_task_filter(date_filter, search_term)
+            filter_name = _describe_filter(date_filter, priority, search_term, project_id)
             
-            return date_match and priority_match and search_match
+            parts = ["Found 1 projects:\n\n"]
+            if not project.get('closed') and 'error' not in project_data:
+                matches = await asyncio.to_thread(_filter_task_records, fetch_id, project_data, task_filter, priority)
+                parts.append(_format_filtered_project(1, project, project_data, matches, filter_name, limit))
+                parts.append(_truncation_note(len(matches), limit))
+            return ToolResult("".join(parts))
         
-        # Build filter description
-        filter_parts = []
-        if date_filter != "all":
-            filter_parts.append(date_filter)
-        if priority is not None:
-            filter_parts.append(f"priority {PRIORITY_MAP[priority]}")
-        if search_term:
-            filter_parts.append(f"matching '{search_term}'")
-        if project_id:
-            filter_parts.append(f"in project '{project_id}'")
+        # All projects
+        projects = await cached_get_projects()
+        if 'error' in projects:
+            return ToolResult(f"Error fetching projects: {projects['error']}", "api_error")
         
-        filter_name = " and ".join(filter_parts) if filter_parts else "all tasks"
+        task_filter = _make_task_filter(date_filter, search_term)
+        filter_name = _describe_filter(date_filter, priority, search_term, project_id)
         
-        # When filtering a specific project, don't add inbox automatically
         # When filtering all projects, include inbox
-        include_inbox = project_id is None
-        return _get_project_tasks_by_filter(projects, task_filter, filter_name, include_inbox=include_inbox)
+        return ToolResult(await _get_project_tasks_by_filter(
+            projects, task_filter, filter_name, include_inbox=True, priority=priority, limit=limit
+        ))
         
     except Exception as e:
         logger.error(f"Error in filter_tasks: {e}")
-        return f"Error filtering tasks: {str(e)}"
+        return ToolResult(f"Error filtering tasks: {str(e)}", "exception")
 
 # GTD Workflow Prompts
 
+_ENGAGED_PROMPT = (
+    "Use the filter_tasks tool to show me all engaged tasks. Engaged tasks are: "
+    "(1) tasks with priority=5 OR (2) tasks with date_filter='overdue' OR "
+    "(3) tasks with date_filter='today'. Format the results as a clear, actionable "
+    "list with project groupings."
+)
+
+_NEXT_ACTIONS_PROMPT = (
+    "Use the filter_tasks tool to show me my next actions. Next actions are: "
+    "(1) tasks with priority=3 OR (2) tasks with date_filter='tomorrow'. "
+    "Format the results as an organized, prioritized list."
+)
+
+def _prompt_response(text: str) -> list:
+    """Wrap prompt text as a single user message."""
+    return [{"role": "user", "content": {"type": "text", "text": text}}]
+
 @mcp.prompt()
 async def engaged() -> list:
     """
@@ -945,15 +1306,7 @@ async def engaged() -> list:
     
     Use this when you need to see what demands your attention right now.
     """
-    return [
-        {
-            "role": "user",
-            "content": {
-                "type": "text",
-                "text": "Use the filter_tasks tool to show me all engaged tasks. Engaged tasks are: (1) tasks with priority=5 OR (2) tasks with date_filter='overdue' OR (3) tasks with date_filter='today'. Format the results as a clear, actionable list with project groupings."
-            }
-        }
-    ]
+    return _prompt_response(_ENGAGED_PROMPT)
 
 @mcp.prompt()
 async def next_actions() -> list:
@@ -966,17 +1319,10 @@ async def next_actions() -> list:
     
     Use this when planning what to work on next.
     """
-    return [
-        {
-            "role": "user",
-            "content": {
-                "type": "text",
-                "text": "Use the filter_tasks tool to show me my next actions. Next actions are: (1) tasks with priority=3 OR (2) tasks with date_filter='tomorrow'. Format the results as an organized, prioritized list."
-            }
-        }
-    ]
+    return _prompt_response(_NEXT_ACTIONS_PROMPT)
 
 @mcp.tool()
+@requires_client
 async def create_subtask(
     subtask_title: str,
     parent_task_id: str,
@@ -1004,22 +1350,16 @@ async def create_subtask(
     Example:
         create_subtask("Buy milk", "63b7bebb91c0a5474805fcd4", "inbox", priority=1)
     """
-    if not ticktick:
-        if not initialize_client():
-            return "Failed to initialize TickTick client. Please check your API credentials."
-    
     # Validate priority
-    if priority not in [0, 1, 3, 5]:
+    if priority not in _VALID_PRIORITIES:
         return "Invalid priority. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)."
     
     try:
-        subtask = ticktick.create_subtask(
-            subtask_title=subtask_title,
-            parent_task_id=parent_task_id,
-            project_id=project_id,
-            content=content,
-            priority=priority
-        )
+        subtask = (await _create_subtasks(
+            parent_task_id,
+            project_id,
+            [{"title": subtask_title, "content": content, "priority": priority}]
+        ))[0]
         
         if 'error' in subtask:
             return f"Error creating subtask: {subtask['error']}"
@@ -1029,6 +1369,103 @@ async def create_subtask(
         logger.error(f"Error in create_subtask: {e}")
         return f"Error creating subtask: {str(e)}"
 
+@mcp.tool()
+@requires_client
+async def create_subtasks(
+    parent_task_id: str,
+    project_id: str,
+    subtasks: List[Dict[str, Any]]
+) -> str:
+    """
+    Create several subtasks for a parent task in one call.
+    
+    Args:
+        parent_task_id: ID of the parent task (required)
+            Example: "63b7bebb91c0a5474805fcd4"
+        project_id: ID of the project (required). Must match the parent task's project.
+            Use "inbox" if the parent task is in the inbox.
+        subtasks: List of subtasks to create. Each subtask is a dictionary with:
+            - title (required): Title of the subtask
+            - content (optional): Content/description for the subtask
+            - priority (optional, default 0): 0 = None, 1 = Low, 3 = Medium, 5 = High
+    
+    Returns:
+        Formatted details of each created subtask, and the error for any that failed.
+    
+    Example:
+        create_subtasks("63b7bebb91c0a5474805fcd4", "inbox",
+                        [{"title": "Buy milk"}, {"title": "Buy eggs", "priority": 1}])
+    """
+    if not subtasks:
+        return "No subtasks provided."
+    
+    # Validate every subtask before creating any of them
+    for i, subtask_data in enumerate(subtasks):
+        error = _validate_subtask_data(subtask_data, i)
+        if error:
+            return f"Validation error: {error}"
+    
+    try:
+        results = await _create_subtasks(parent_task_id, project_id, subtasks)
+        
+        created = sum(1 for result in results if 'error' not in result)
+        parts = [f"Created {created} of {len(results)} subtasks:\n\n"]
+        for i, result in enumerate(results, 1):
+            if 'error' in result:
+                parts.append(f"Subtask {i}: Error: {result['error']}\n\n")
+            else:
+                parts.extend((f"Subtask {i}:\n", format_task(result), "\n"))
+        
+        return "".join(parts)
+    except Exception as e:
+        logger.error(f"Error in create_subtasks: {e}")
+        return f"Error creating subtasks: {str(e)}"
+
+def _validate_subtask_data(subtask_data: Dict[str, Any], subtask_index: int) -> Optional[str]:
+    """
+    Validate a single subtask's data for batch creation.
+    
+    Returns:
+        None if valid, error message string if invalid
+    """
+    if not isinstance(subtask_data, dict):
+        return f"Subtask {subtask_index + 1}: must be a dictionary"
+    
+    if not subtask_data.get('title'):
+        return f"Subtask {subtask_index + 1}: 'title' is required and cannot be empty"
+    
+    priority = subtask_data.get('priority', 0)
+    if priority not in _VALID_PRIORITIES:
+        return f"Subtask {subtask_index + 1}: Invalid priority {priority}. Must be 0 (None), 1 (Low), 3 (Medium), or 5 (High)"
+    
+    return None
+
+async def _create_subtasks(parent_task_id: str, project_id: str, subtasks: List[Dict[str, Any]]) -> List[Dict]:
+    """
+    Create validated subtasks, one after another in the order given.
+    
+    The Open API creates one task per request and orders tasks by arrival,
+    so the requests are sent in sequence to keep the subtasks in the order
+    the caller listed them. A failed subtask doesn't stop the rest.
+    
+    Returns:
+        The API response for each subtask, in the order given
+    """
+    results = []
+    try:
+        for subtask_data in subtasks:
+            results.append(await _call_api(
+                ticktick.create_subtask,
+                subtask_title=subtask_data['title'],
+                parent_task_id=parent_task_id,
+                project_id=project_id,
+                content=subtask_data.get('content'),
+                priority=subtask_data.get('priority', 0)
+            ))
+    finally:
+        _invalidate_cache(project_id)
+    return results
+
 def main():
     """Main entry point for the MCP server."""
     # Initialize the TickTick client
@@ -1,7 +1,9 @@
 import os
 import json
 import base64
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from pathlib import Path
 from dotenv import load_dotenv
@@ -34,6 +36,13 @@ class TickTickClient:
             "Accept-Encoding": None,
             "User-Agent": 'curl/8.7.1'
         }
+        
+        # Share one session so requests reuse pooled keep-alive connections
+        # instead of paying a new TLS handshake for every API call
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=10)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def _refresh_access_token(self) -> bool:
         """
@@ -68,7 +77,7 @@ class TickTickClient:
         
         try:
             # Send the token request
-            response = requests.post(self.token_url, data=token_data, headers=headers)
+            response = self.session.post(self.token_url, data=token_data, headers=headers)
             response.raise_for_status()
             
             # Parse the response
@@ -142,15 +151,17 @@ class TickTickClient:
             API response as a dictionary
         """
         url = f"{self.base_url}{endpoint}"
+        # Serialize the body with orjson; the Content-Type header is already set
+        body = orjson.dumps(data) if data is not None else None
         
         try:
             # Make the request
             if method == "GET":
-                response = requests.get(url, headers=self.headers)
+                response = self.session.get(url, headers=self.headers)
             elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
+                response = self.session.post(url, headers=self.headers, data=body)
             elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers)
+                response = self.session.delete(url, headers=self.headers)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
             
@@ -162,23 +173,28 @@ class TickTickClient:
                 if self._refresh_access_token():
                     # Retry the request with the new token
                     if method == "GET":
-                        response = requests.get(url, headers=self.headers)
+                        response = self.session.get(url, headers=self.headers)
                     elif method == "POST":
-                        response = requests.post(url, headers=self.headers, json=data)
+                        response = self.session.post(url, headers=self.headers, data=body)
                     elif method == "DELETE":
-                        response = requests.delete(url, headers=self.headers)
+                        response = self.session.delete(url, headers=self.headers)
             
             # Raise an exception for 4xx/5xx status codes
             response.raise_for_status()
             
             # Return empty dict for 204 No Content
-            if response.status_code == 204 or response.text == "":
+            if response.status_code == 204 or not response.content:
                 return {}
             
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"API request failed: {e}")
-            return {"error": str(e)}
+            error = {"error": str(e)}
+            # Keep the HTTP status so callers can tell e.g. a missing resource from other failures
+            response = getattr(e, 'response', None)
+            if response is not None:
+                error["status_code"] = response.status_code
+            return error
     
     # Project methods
     def get_projects(self) -> List[Dict]: